@@ -1,147 +1,436 @@
 from flask import Flask, request, jsonify
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+import logging
+import operator
+from logging.handlers import QueueHandler, QueueListener
 import os
-from datetime import datetime, timezone
-import re
-from threading import Thread
-import time
-from queue import Queue
+import queue
+import sys
+import atexit
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from pydantic import BaseModel, ValidationError
 
 # --- Configuration ---
 DISCORD_WEBHOOK_URL = os.environ.get("DISCORD_WEBHOOK_URL", "YOUR_DISCORD_WEBHOOK_URL_HERE")
-FLASK_PORT = int(os.environ.get("FLASK_PORT", 5001))
+# Checked once here rather than on every send
+DISCORD_CONFIGURED = bool(DISCORD_WEBHOOK_URL) and "YOUR_DISCORD_WEBHOOK_URL_HERE" not in DISCORD_WEBHOOK_URL
+# DEBUG adds per-request traces; records below this level are dropped before any formatting
+LOG_LEVEL = (os.environ.get("LOG_LEVEL") or "INFO").strip().upper()
+WORKER_THREADS = int(os.environ.get("WORKER_THREADS", 8))
+# Past this many queued payloads the endpoint answers 503 so Alchemy retries later instead of us buffering without bound
+MAX_PENDING_PAYLOADS = int(os.environ.get("MAX_PENDING_PAYLOADS", 1000))
+
+# Only this decoded event is forwarded to Discord
+TARGET_DISPUTE_EVENT_NAME = "DisputePrice"
+
+# Delimiters that end the title inside UMA ancillary data (matched case-insensitively on the raw bytes)
+_TITLE_KEY = b"title:"
+_TITLE_TERMINATORS = (b", desc:", b"resolution_criteria:", b"\n")
+_ASCII_WHITESPACE = b" \t\n\r\x0b\x0c"
+_COMMA = ord(",")
+
+# DisputePrice params that the embed actually reads, with their fallbacks; everything else is skipped while parsing
+_PARAM_DEFAULTS = {"identifier": "N/A", "ancillaryData": "", "proposedPrice": None, "disputer": "N/A"}
+_WANTED_PARAMS = frozenset(_PARAM_DEFAULTS)
+# Unpacks in _PARAM_DEFAULTS order: identifier, ancillaryData, proposedPrice, disputer
+_GET_PARAMS = operator.itemgetter(*_PARAM_DEFAULTS)
+
+# The title sits near the start of the ancillary data, so only this many bytes are decoded at first
+ANCILLARY_PREFIX_BYTES = 2048
+
+# How many (tx hash, log index) pairs to remember for dropping re-delivered events
+SEEN_EVENTS_MAX = 10000
+
+# Discord accepts at most this many embeds in a single webhook message, and this many characters across them
+DISCORD_MAX_EMBEDS = 10
+DISCORD_MAX_EMBED_CHARS = 6000
+
+# Block explorer for each Alchemy network name; see explorer_for() for unlisted networks
+_EXPLORER = {
+    "ETH_MAINNET": "https://etherscan.io",
+    "ETH_GOERLI": "https://goerli.etherscan.io",
+    "ETH_SEPOLIA": "https://sepolia.etherscan.io",
+    "MATIC_MAINNET": "https://polygonscan.com",
+    "POLYGON_MAINNET": "https://polygonscan.com",
+    "MATIC_MUMBAI": "https://mumbai.polygonscan.com",
+    "MATIC_AMOY": "https://amoy.polygonscan.com",
+}
+DEFAULT_EXPLORER = "https://etherscan.io"
+
+# Constant part of every dispute embed; per-event fields are layered on top of a copy
+_EMBED_SKELETON = {"title": "❌ Price Disputed ❌", "color": 0xFF0000}
+
+# Known proposedPrice values (18-decimal fixed point) and how to label them
+_PRICE_MAP = {
+    0: "p1 (e.g., NO)",
+    10**18: "p2 (e.g., YES)",
+    5 * 10**17: "p3 (e.g., 0.5/INVALID)",
+}
 
 # --- Application Setup ---
+# QueueHandler merges the message args on the emitting thread; the listener thread adds the timestamp and does the I/O.
+# stdout, as the original print calls used, so log collectors do not tag every INFO line as an error
+_log_queue = queue.Queue(-1)
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter("[%(asctime)s.%(msecs)03d] %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
+_log_listener = QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+def _resolve_log_level(level_name):
+    # Accepts level names ("DEBUG", "WARN") or numbers ("10"); None for anything logging does not know
+    if level_name.isdigit(): return int(level_name)
+    level = logging.getLevelName(level_name)
+    return level if isinstance(level, int) else None
+
+logger = logging.getLogger("alchemy")
+_log_level = _resolve_log_level(LOG_LEVEL)
+# A typo in LOG_LEVEL should not stop every worker from booting
+logger.setLevel(logging.INFO if _log_level is None else _log_level)
+logger.addHandler(QueueHandler(_log_queue))
+logger.propagate = False
+if _log_level is None:
+    logger.warning("Unknown LOG_LEVEL %r; using INFO.", LOG_LEVEL)
+
 app = Flask(__name__)
-# Create a thread-safe queue to hold incoming webhook payloads
-webhook_queue = Queue()
+# Shared session so every Discord POST reuses a warm keep-alive TLS connection.
+# Only retries that cannot double-post: connect errors and 429/503 (rejected before posting, honouring Retry-After).
+# Read timeouts and 500/502/504 may follow a message Discord already posted, so read=0 and those fail instead.
+# Worst case is 4 attempts x 10s timeout plus backoff (or Retry-After), with one payload worker blocked per batch.
+_DISCORD_RETRY = Retry(
+    total=3, read=0, backoff_factor=0.2, status_forcelist=(429, 503),
+    allowed_methods=frozenset(["POST"]), respect_retry_after_header=True,
+)
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=_DISCORD_RETRY))
+# Warm, bounded pool for payload processing; queued payloads are visible on the health check
+EXECUTOR = ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix="alchemy-wh")
+atexit.register(EXECUTOR.shutdown, wait=True)
+# Bounded pool so the extra embed batches of one payload are posted in parallel rather than one RTT after another
+_discord_pool = ThreadPoolExecutor(max_workers=8)
+
+# --- Payload Models ---
+# Only the fields this receiver reads; pydantic-core parses and validates the raw body in one pass
+class EventParam(BaseModel):
+    name: str
+    value: Any = None
+
+class DecodedLog(BaseModel):
+    name: str | None = None
+    params: list[EventParam] = []
+
+class ActivityLog(BaseModel):
+    logIndex: Any = None
+    decoded: DecodedLog | None = None
+
+class Activity(BaseModel):
+    hash: str | None = None
+    log: ActivityLog | None = None
+
+class AlchemyEvent(BaseModel):
+    network: str = "ETH_MAINNET"
+    activity: list[Activity] = []
+
+class AlchemyPayload(BaseModel):
+    event: AlchemyEvent | None = None
+    createdAt: str | None = None
 
 # --- Helper Functions ---
-def log_timestamp(message):
-    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}] {message}")
+# Alchemy re-delivers a webhook when its ack is lost; remember recent events so a dispute is only posted once.
+# Best-effort: the memory is per process, so a re-delivery that lands on another gunicorn worker is posted again,
+# and a re-delivery skipped while the first copy was still posting is not retried if that POST then fails.
+_seen_events = OrderedDict()
+_seen_lock = threading.Lock()
 
-def hex_to_string(hex_str):
-    if hex_str.startswith("0x"):
-        hex_str = hex_str[2:]
+def already_processed(event_key):
+    # Claims the key as it checks it, so a re-delivery racing the first copy is skipped; forget_event undoes the claim
+    with _seen_lock:
+        if event_key in _seen_events:
+            _seen_events.move_to_end(event_key)
+            return True
+        _seen_events[event_key] = None
+        if len(_seen_events) > SEEN_EVENTS_MAX:
+            _seen_events.popitem(last=False)
+        return False
+
+def forget_event(event_key):
+    # Releases a claim whose dispute was never posted, so Alchemy's next re-delivery is not skipped
+    with _seen_lock:
+        _seen_events.pop(event_key, None)
+
+def hex_to_bytes(hex_str, max_bytes=None):
+    # Expects bare hex digits; callers strip any 0x prefix
+    if max_bytes is not None:
+        hex_str = hex_str[:max_bytes * 2]
     try:
-        return bytes.fromhex(hex_str).decode('utf-8', errors='replace')
+        return bytes.fromhex(hex_str)
     except Exception as e:
-        log_timestamp(f"Error decoding hex: {e}")
+        logger.error("Error decoding hex: %s", e)
         return None
 
-def extract_title_from_ancillary(ancillary_data_str):
-    if not ancillary_data_str: return None
-    match = re.search(r"title:\s*(.*?)(?:,\s*description:|, desc:|resolution_criteria:|\n|$)", ancillary_data_str, re.IGNORECASE | re.DOTALL)
-    if match:
-        title = match.group(1).strip().replace('\u0000', '').strip()
-        return title[:250] + "..." if len(title) > 250 else title
-    return None
+def _find_description_terminator(lowered, start):
+    # Equivalent of the ",\s*description:" delimiter: a comma, optional whitespace, then the key
+    i = lowered.find(b"description:", start)
+    while i >= 0:
+        j = i
+        while j > start and lowered[j - 1] in _ASCII_WHITESPACE: j -= 1
+        if j > start and lowered[j - 1] == _COMMA: return j - 1
+        i = lowered.find(b"description:", i + 1)
+    return -1
+
+def _find_title_span(ancillary_data):
+    """
+    Linear scan over the raw ancillary bytes for the text between "title:" and the nearest delimiter.
+    Avoids the backtracking a lazy DOTALL regex does on long ancillary blobs, and bytes.lower()
+    only folds ASCII, so offsets in the lowered copy line up with the original.
+    Returns (start, stop) offsets, with stop == len(ancillary_data) when no delimiter follows.
+    """
+    lowered = ancillary_data.lower()
+    i = lowered.find(_TITLE_KEY)
+    if i < 0: return None
+    start = i + len(_TITLE_KEY)
+    while start < len(lowered) and lowered[start] in _ASCII_WHITESPACE: start += 1
+
+    ends = [lowered.find(t, start) for t in _TITLE_TERMINATORS]
+    ends.append(_find_description_terminator(lowered, start))
+    ends = [e for e in ends if e >= 0]
+    return start, min(ends) if ends else len(ancillary_data)
+
+def _may_continue_past(lowered, start, stop):
+    # True when a ",\s*description:" delimiter may have been cut off by the prefix end: only its comma and whitespace
+    # (whose "\n" then looks like the terminator) and perhaps the start of "description:" are left in the prefix
+    j = stop
+    while j > start and lowered[j - 1] in _ASCII_WHITESPACE: j -= 1
+    if j == start or lowered[j - 1] != _COMMA: return False
+    k = stop
+    while k < len(lowered) and lowered[k] in _ASCII_WHITESPACE: k += 1
+    return b"description:".startswith(lowered[k:])
+
+def _clean_title(raw_title):
+    title = raw_title.strip().replace('\u0000', '').strip()
+    return title[:250] + "..." if len(title) > 250 else title
+
+def extract_title_from_ancillary(ancillary_data):
+    # Only the title slice is UTF-8 decoded; the rest of the blob is never validated
+    if not ancillary_data: return None
+    span = _find_title_span(ancillary_data)
+    if span is None: return None
+    return _clean_title(ancillary_data[span[0]:span[1]].decode('utf-8', errors='replace'))
+
+def title_from_ancillary_hex(ancillary_data_hex):
+    """
+    Converts only the first ANCILLARY_PREFIX_BYTES of the ancillary data and looks for the title there.
+    Falls back to the whole blob when the title is missing from, or runs past, that prefix, including when
+    a description delimiter straddles the cut.
+    """
+    hex_digits = ancillary_data_hex[2:] if ancillary_data_hex[:2] in ("0x", "0X") else ancillary_data_hex
+    ancillary_data = hex_to_bytes(hex_digits, max_bytes=ANCILLARY_PREFIX_BYTES)
+    if len(hex_digits) > ANCILLARY_PREFIX_BYTES * 2:
+        span = _find_title_span(ancillary_data) if ancillary_data else None
+        if (span is None or span[1] == len(ancillary_data)
+                or _may_continue_past(ancillary_data.lower(), span[0], span[1])):
+            ancillary_data = hex_to_bytes(hex_digits)
+    return extract_title_from_ancillary(ancillary_data)
+
+@functools.lru_cache(maxsize=16)
+def explorer_for(network):
+    # Known networks come from the table; unlisted Polygon variants still get polygonscan, not Etherscan
+    explorer = _EXPLORER.get(network)
+    if explorer is None:
+        explorer = "https://polygonscan.com" if "POLYGON" in network or "MATIC" in network else DEFAULT_EXPLORER
+    return explorer
+
+def price_label(raw_proposed_price):
+    # Accepts ints as well as decimal or 0x-prefixed hex strings; anything else (floats, bools, None) is shown as-is
+    if isinstance(raw_proposed_price, str):
+        try:
+            price_value = int(raw_proposed_price, 0)
+        except ValueError:
+            return raw_proposed_price
+    elif isinstance(raw_proposed_price, int) and not isinstance(raw_proposed_price, bool):
+        price_value = raw_proposed_price
+    else:
+        return str(raw_proposed_price)
+    return _PRICE_MAP.get(price_value, str(raw_proposed_price))
+
+def _embed_chars(embed):
+    # The text Discord counts towards its per-message limit: title, description, field names/values and footer
+    chars = len(embed.get("title", "")) + len(embed.get("description", "")) + len(embed.get("footer", {}).get("text", ""))
+    for field in embed.get("fields", ()):
+        chars += len(field["name"]) + len(field["value"])
+    return chars
+
+def batch_embeds(embeds):
+    """Splits embeds into messages that stay within both Discord's embed-count and total-character limits."""
+    batches, batch, batch_chars = [], [], 0
+    for embed in embeds:
+        chars = _embed_chars(embed)
+        if batch and (len(batch) == DISCORD_MAX_EMBEDS or batch_chars + chars > DISCORD_MAX_EMBED_CHARS):
+            batches.append(batch)
+            batch, batch_chars = [], 0
+        batch.append(embed)
+        batch_chars += chars
+    if batch:
+        batches.append(batch)
+    return batches
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 def send_to_discord(embeds=None):
-    if not DISCORD_WEBHOOK_URL or "YOUR_DISCORD_WEBHOOK_URL_HERE" in DISCORD_WEBHOOK_URL:
-        log_timestamp("Error: DISCORD_WEBHOOK_URL not configured.")
-        return
-    if not embeds: return
+    if not DISCORD_CONFIGURED:
+        logger.error("Error: DISCORD_WEBHOOK_URL not configured.")
+        return False
+    if not embeds: return True
 
     try:
-        log_timestamp("Posting embed to Discord...")
-        response = requests.post(DISCORD_WEBHOOK_URL, json={"embeds": embeds}, timeout=10)
+        logger.debug("Posting %d embed(s) to Discord...", len(embeds))
+        body = orjson.dumps({"embeds": embeds})
+        response = session.post(DISCORD_WEBHOOK_URL, data=body, headers=_JSON_HEADERS, timeout=10)
         response.raise_for_status()
-        log_timestamp(f"Discord POST successful (Status: {response.status_code}).")
-    except requests.exceptions.Timeout:
-        log_timestamp("Error sending to Discord: Timeout.")
+        logger.info("Discord POST successful (Status: %s).", response.status_code)
+        return True
     except requests.exceptions.RequestException as e:
-        log_timestamp(f"Error sending to Discord: {e}")
+        logger.error("Error sending to Discord: %s", e)
+        return False
+
+def post_batches(batches):
+    """Posts each batch of embeds, the first on the calling thread and any others in parallel on _discord_pool."""
+    futures = []
+    for batch in batches[1:]:
+        try:
+            futures.append(_discord_pool.submit(send_to_discord, embeds=batch))
+        except RuntimeError:
+            # The interpreter is exiting and no pool accepts new work; post the batch from this thread instead
+            futures.append(None)
+    results = [send_to_discord(embeds=batches[0])]
+    for batch, future in zip(batches[1:], futures):
+        results.append(send_to_discord(embeds=batch) if future is None else future.result())
+    return results
+
+# --- Main Processing Function ---
+def build_dispute_embed(activity_item, decoded_event, etherscan_base, footer, created_at):
+    """Builds the Discord embed for one DisputePrice activity."""
+    event_params = _PARAM_DEFAULTS.copy()
+    event_params.update((p.name, p.value) for p in decoded_event.params if p.name in _WANTED_PARAMS)
+    market_identifier_hex, ancillary_data_hex, raw_proposed_price, disputer_address = _GET_PARAMS(event_params)
+
+    human_readable_title = "N/A"
+    if ancillary_data_hex and ancillary_data_hex != "0x":
+        extracted_title = title_from_ancillary_hex(ancillary_data_hex)
+        if extracted_title:
+            human_readable_title = extracted_title
 
-# --- Main Worker Function ---
-def queue_worker():
+    disputed_answer = price_label(raw_proposed_price)
+
+    tx_hash = activity_item.hash or "N/A"
+
+    display_title = human_readable_title if human_readable_title != "N/A" else f"Market Identifier: `{market_identifier_hex}`"
+
+    embed = _EMBED_SKELETON.copy()
+    embed["description"] = f"**Title/Market:** {display_title}\n"
+    embed["fields"] = [
+        {"name": "Disputed Outcome", "value": str(disputed_answer), "inline": True},
+        {"name": "Disputer", "value": f"[{str(disputer_address)}]({etherscan_base}/address/{disputer_address})", "inline": True},
+        {"name": "Transaction", "value": f"[{tx_hash[:12]}...]({etherscan_base}/tx/{tx_hash})", "inline": False},
+    ]
+    embed["footer"] = footer
+    embed["timestamp"] = created_at
+    return embed
+
+def process_payload(payload):
     """
-    A long-running worker that processes items from the webhook_queue.
+    Parses a single webhook payload and forwards any DisputePrice events to Discord.
+    Runs on EXECUTOR so the endpoint can acknowledge Alchemy immediately.
     """
-    log_timestamp("Queue worker thread started.")
-    while True:
-        try:
-            # Wait for a payload to become available in the queue
-            payload = webhook_queue.get()
-            log_timestamp(f"Worker pulled payload from queue. Queue size is now: {webhook_queue.qsize()}")
-            
-            # Start processing the payload
-            if payload.get("event") and payload["event"].get("activity"):
-                for activity_item in payload["event"]["activity"]:
-                    log_data = activity_item.get("log")
-                    if log_data and log_data.get("decoded"):
-                        decoded_event = log_data["decoded"]
-                        event_name = decoded_event.get("name")
-                        
-                        if event_name == "DisputePrice":
-                            # ... (All the parsing and embed creation logic from the previous script) ...
-                            # This part is the same as before, just happening inside the worker
-                            params = decoded_event.get("params", [])
-                            event_params = {p["name"]: p["value"] for p in params}
-                            market_identifier_hex = event_params.get("identifier", "N/A")
-                            ancillary_data_hex = event_params.get("ancillaryData", "")
-                            human_readable_title = "N/A"
-                            if ancillary_data_hex and ancillary_data_hex != "0x":
-                                ancillary_data_str = hex_to_string(ancillary_data_hex)
-                                if ancillary_data_str:
-                                    extracted_title = extract_title_from_ancillary(ancillary_data_str)
-                                    if extracted_title:
-                                        human_readable_title = extracted_title
-                            
-                            raw_proposed_price = event_params.get("proposedPrice")
-                            disputed_answer = str(raw_proposed_price)
-                            price_value_str = str(raw_proposed_price)
-                            if price_value_str == "0": disputed_answer = "p1 (e.g., NO)"
-                            elif price_value_str == "1000000000000000000": disputed_answer = "p2 (e.g., YES)"
-                            elif price_value_str == "500000000000000000": disputed_answer = "p3 (e.g., 0.5/INVALID)"
-
-                            tx_hash = activity_item.get("hash", "N/A")
-                            disputer_address = event_params.get("disputer", "N/A")
-                            network = payload.get("event", {}).get("network", "ETH_MAINNET").upper()
-                            etherscan_base = "https://polygonscan.com" if "POLYGON" in network or "MATIC" in network else "https://etherscan.io"
-                            
-                            display_title = human_readable_title if human_readable_title != "N/A" else f"Market Identifier: `{market_identifier_hex}`"
-                            
-                            embed = {
-                                "title": "❌ Price Disputed ❌", "description": f"**Title/Market:** {display_title}\n", "color": 0xFF0000,
-                                "fields": [
-                                    {"name": "Disputed Outcome", "value": str(disputed_answer), "inline": True},
-                                    {"name": "Disputer", "value": f"[{str(disputer_address)}]({etherscan_base}/address/{disputer_address})", "inline": True},
-                                    {"name": "Transaction", "value": f"[{tx_hash[:12]}...]({etherscan_base}/tx/{tx_hash})", "inline": False},
-                                ],
-                                "footer": {"text": f"Network: {network}"}, "timestamp": payload.get("createdAt")
-                            }
-                            send_to_discord(embeds=[embed])
-
-            # Mark the task as done
-            webhook_queue.task_done()
-        except Exception as e:
-            log_timestamp(f"Error in queue_worker: {e}")
-            # Ensure task_done is called even on error to prevent blocking
-            webhook_queue.task_done()
+    # Keys claimed for embeds that have not been posted yet; whatever is left on failure is released for re-delivery
+    embeds_to_send, event_keys = [], []
+    try:
+        event = payload.event
+        if event and event.activity:
+            # Network and explorer are payload-level, so resolve them once rather than per activity
+            network = event.network.upper()
+            etherscan_base = explorer_for(network)
+            footer = {"text": f"Network: {network}"}
+
+            for activity_item in event.activity:
+                decoded_event = activity_item.log.decoded if activity_item.log else None
+                # Filter first: everything below is only worth doing for dispute events
+                if decoded_event is None or decoded_event.name != TARGET_DISPUTE_EVENT_NAME:
+                    continue
+                # Without a log index two disputes in one tx would share a key, so only dedupe fully identified events
+                event_key = None
+                if activity_item.hash and activity_item.log.logIndex is not None:
+                    event_key = (activity_item.hash, activity_item.log.logIndex)
+                    if already_processed(event_key):
+                        logger.info("Skipping already processed dispute in tx %s.", activity_item.hash)
+                        continue
+
+                # Isolate each dispute so one malformed activity cannot drop the good ones beside it
+                try:
+                    embeds_to_send.append(build_dispute_embed(activity_item, decoded_event, etherscan_base, footer, payload.createdAt))
+                    event_keys.append(event_key)
+                except Exception as e:
+                    if event_key is not None:
+                        forget_event(event_key)
+                    logger.error("Error processing dispute in tx %s: %s", activity_item.hash, e)
+
+        if embeds_to_send:
+            batches = batch_embeds(embeds_to_send)
+            # Batches are contiguous runs of embeds_to_send, so each one's keys are the matching slice of event_keys
+            start = 0
+            for batch, sent in zip(batches, post_batches(batches)):
+                if not sent:
+                    for event_key in event_keys[start:start + len(batch)]:
+                        if event_key is not None:
+                            forget_event(event_key)
+                start += len(batch)
+            event_keys = []
+    except Exception as e:
+        for event_key in event_keys:
+            if event_key is not None:
+                forget_event(event_key)
+        logger.error("Error in process_payload: %s", e)
 
 # --- Webhook Endpoint (Now very fast) ---
 @app.route('/alchemy-webhook', methods=['POST'])
 def alchemy_webhook_receiver():
-    log_timestamp("Webhook request received.")
+    logger.debug("Webhook request received.")
     try:
-        payload = request.json
-        if not payload:
-            log_timestamp("Received empty or invalid payload.")
+        pending = EXECUTOR._work_queue.qsize()
+        if pending >= MAX_PENDING_PAYLOADS:
+            logger.warning("Worker pool saturated (%d payloads waiting), rejecting webhook.", pending)
+            return jsonify({"status": "error", "message": "Receiver busy, retry later"}), 503
+
+        try:
+            payload = AlchemyPayload.model_validate_json(request.get_data(cache=False))
+        except ValidationError:
+            payload = None
+        if payload is None or payload.event is None:
+            logger.warning("Received empty or invalid payload.")
             return jsonify({"status": "error", "message": "Empty or invalid payload"}), 400
 
-        # Put the payload into the queue for the background worker to process
-        webhook_queue.put(payload)
-        log_timestamp(f"Payload added to queue. Queue size is now: {webhook_queue.qsize()}")
+        # Hand off to the worker pool so one slow Discord POST never delays the next payload
+        EXECUTOR.submit(process_payload, payload)
+        logger.debug("Payload handed off for processing.")
 
         # Immediately return a success response to Alchemy
         return jsonify({"status": "success", "message": "Webhook received and queued"}), 200
     except Exception as e:
-        log_timestamp(f"Error handling initial request: {e}")
+        logger.error("Error handling initial request: %s", e)
         return jsonify({"status": "error", "message": "Error handling initial request"}), 500
 
 # --- Health Check ---
+# Probed frequently by the platform, so only the backlog counter is formatted per call
+_HEALTH_PREFIX = b"Webhook receiver is alive! Payloads waiting: "
+_HEALTH_HEADERS = {"Content-Type": "text/plain; charset=utf-8"}
+
 @app.route('/', methods=['GET'])
 def health_check():
-    return f"Webhook receiver is alive! Items in queue: {webhook_queue.qsize()}", 200
\ No newline at end of file
+    return _HEALTH_PREFIX + str(EXECUTOR._work_queue.qsize()).encode(), 200, _HEALTH_HEADERS
\ No newline at end of file
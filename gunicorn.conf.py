@@ -0,0 +1,14 @@
+# Gunicorn settings for the webhook receiver; used by the Procfile
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', os.environ.get('FLASK_PORT', '5001'))}"
+
+# gevent workers monkey-patch sockets and threads, so Discord POSTs and payload threads yield cooperatively
+worker_class = "gevent"
+# One worker by default: it already holds worker_connections for this I/O-bound receiver, and the re-delivery
+# dedupe in app.py is per process, so more workers let duplicates through
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+worker_connections = 1000
+
+# Keep connections from Alchemy's delivery retries open between requests
+keepalive = 75